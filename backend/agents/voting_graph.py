@@ -14,6 +14,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import get_model_instance, DEFAULT_CHAT_MODEL_ID, is_valid_model
+from executor import run_blocking
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 import operator
 
@@ -104,7 +105,7 @@ def input_node(state: VotingGraphState):
         }
     return state
 
-def logical_agent_node(state: VotingGraphState):
+async def logical_agent_node(state: VotingGraphState):
     """論理的思考エージェント"""
     llm = get_model_instance(DEFAULT_CHAT_MODEL_ID, temperature=0.1)
     
@@ -113,14 +114,14 @@ def logical_agent_node(state: VotingGraphState):
     user_message = HumanMessage(content=user_query)
     
     messages = [system_message, user_message]
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     
     agent_responses = state.get("agent_responses", {})
     agent_responses["logical_agent"] = response.content
     
     return {"agent_responses": agent_responses}
 
-def empathetic_agent_node(state: VotingGraphState):
+async def empathetic_agent_node(state: VotingGraphState):
     """共感重視エージェント"""
     llm = get_model_instance(DEFAULT_CHAT_MODEL_ID, temperature=0.7)
     
@@ -129,14 +130,14 @@ def empathetic_agent_node(state: VotingGraphState):
     user_message = HumanMessage(content=user_query)
     
     messages = [system_message, user_message]
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     
     agent_responses = state.get("agent_responses", {})
     agent_responses["empathetic_agent"] = response.content
     
     return {"agent_responses": agent_responses}
 
-def concise_agent_node(state: VotingGraphState):
+async def concise_agent_node(state: VotingGraphState):
     """簡潔要約エージェント"""
     llm = get_model_instance(DEFAULT_CHAT_MODEL_ID, temperature=0.3)
     
@@ -145,14 +146,14 @@ def concise_agent_node(state: VotingGraphState):
     user_message = HumanMessage(content=user_query)
     
     messages = [system_message, user_message]
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     
     agent_responses = state.get("agent_responses", {})
     agent_responses["concise_agent"] = response.content
     
     return {"agent_responses": agent_responses}
 
-def voting_node(state: VotingGraphState):
+async def voting_node(state: VotingGraphState):
     """投票集計ノード - 各エージェントが他の応答を評価"""
     llm = get_model_instance(DEFAULT_CHAT_MODEL_ID, temperature=0.1)
     
@@ -200,7 +201,7 @@ JSON以外の文章や説明は一切含めないでください。
         user_message = HumanMessage(content=voting_prompt)
         
         messages = [system_message, user_message]
-        response = llm.invoke(messages)
+        response = await llm.ainvoke(messages)
         
         try:
             # JSONレスポンスをパース
@@ -525,7 +526,7 @@ async def voting_graph_chat(query: str, thread_id: str = "default", model_id: st
         # 初回メッセージの場合、タイトルを生成・保存
         updated_title = None
         if is_first_message:
-            title = generate_voting_title(query, model_id)
+            title = await run_blocking(generate_voting_title, query, model_id)
             save_voting_session_title(thread_id, title)
             updated_title = title
             
@@ -646,7 +647,7 @@ async def voting_graph_chat_stream(query: str, thread_id: str = "default", model
         # 初回メッセージの場合、タイトルを生成・保存
         updated_title = None
         if is_first_message:
-            title = generate_voting_title(query, model_id)
+            title = await run_blocking(generate_voting_title, query, model_id)
             save_voting_session_title(thread_id, title)
             updated_title = title
             
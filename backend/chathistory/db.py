@@ -0,0 +1,133 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# チャット履歴DBのパス（環境変数 SQLITE_DB_PATH で上書き可能）
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite", "chathistory.db")
+DB_PATH = os.getenv("SQLITE_DB_PATH") or DEFAULT_DB_PATH
+
+# 読み取り用コネクションプールのサイズ
+READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+# ロック待ちのタイムアウト（秒）
+BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "30"))
+
+
+def _connect(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """WALモードのSQLite接続を作成"""
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=BUSY_TIMEOUT_SECONDS)
+    # WALモードでは読み取りが書き込み（チェックポイント保存）をブロックせず、その逆も同様
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class SqliteConnectionPool:
+    """
+    読み取り用コネクションの小さなプールと、直列化された単一の書き込み用コネクションを管理する
+
+    Parameters
+    ----------
+    db_path : str
+        SQLiteデータベースファイルのパス
+    read_pool_size : int, optional
+        読み取り用コネクションの最大数
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = READ_POOL_SIZE):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.read_pool_size = max(1, read_pool_size)
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.read_pool_size:
+                self._reader_count += 1
+                return _connect(self.db_path, read_only=True)
+        # 上限に達している場合は返却を待つ
+        return self._readers.get()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """読み取り専用コネクションを借りる（書き込み中でも並行して読み取れる）"""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            # 読み取りトランザクションを残さない
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """書き込み用コネクションを排他的に借りる（正常終了時にcommit、例外時にrollback）"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _connect(self.db_path)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+
+    def close(self) -> None:
+        """すべてのコネクションを閉じる"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._reader_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+
+
+pool = SqliteConnectionPool(DB_PATH)
+
+# 非同期チェックポインター（イベントループごとに遅延初期化）
+_checkpointer: Optional[AsyncSqliteSaver] = None
+_checkpointer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_checkpointer() -> AsyncSqliteSaver:
+    """
+    LangGraph用の非同期チェックポインターを取得（必要に応じて初期化）
+
+    Returns
+    -------
+    AsyncSqliteSaver
+        aiosqlite接続を専用スレッドで保持するチェックポインター
+    """
+    global _checkpointer, _checkpointer_loop
+    loop = asyncio.get_running_loop()
+    if _checkpointer is None or _checkpointer_loop is not loop:
+        async_conn = aiosqlite.connect(DB_PATH, timeout=BUSY_TIMEOUT_SECONDS)
+        checkpointer = AsyncSqliteSaver(async_conn)
+        await checkpointer.setup()
+        _checkpointer, _checkpointer_loop = checkpointer, loop
+    return _checkpointer
@@ -8,7 +8,6 @@ from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.sqlite import SqliteSaver
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 
 from dotenv import load_dotenv
@@ -19,6 +18,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import get_model_instance, is_valid_model, DEFAULT_CHAT_MODEL_ID
+from executor import run_blocking
+from chathistory.db import pool, get_checkpointer
 
 
 class State(BaseModel):
@@ -30,48 +31,39 @@ class State(BaseModel):
     request_model_id: str = Field(default="", description="リクエストごとのモデルID")
 
 
-db_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite")
-os.makedirs(db_dir, exist_ok=True)
-db_path = os.path.join(db_dir, "chathistory.db")
-
-conn = sqlite3.connect(db_path, check_same_thread=False)
-checkpointer = SqliteSaver(conn)
-# データベーステーブルを初期化
-checkpointer.setup()
-
 def setup_session_titles_table():
     """セッションタイトル管理用のテーブルを作成・更新"""
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS session_titles (
-            thread_id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    # 既存のテーブルにカラムを追加するためのエラーハンドリング
-    try:
-        cursor.execute("ALTER TABLE session_titles ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e):
-            raise
-    try:
-        cursor.execute("ALTER TABLE session_titles ADD COLUMN last_message_at TIMESTAMP")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e):
-            raise
-    try:
-        cursor.execute("ALTER TABLE session_titles ADD COLUMN category TEXT NOT NULL DEFAULT 'chat_with_history'")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e):
-            raise
-    conn.commit()
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS session_titles (
+                thread_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # 既存のテーブルにカラムを追加するためのエラーハンドリング
+        try:
+            cursor.execute("ALTER TABLE session_titles ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" not in str(e):
+                raise
+        try:
+            cursor.execute("ALTER TABLE session_titles ADD COLUMN last_message_at TIMESTAMP")
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" not in str(e):
+                raise
+        try:
+            cursor.execute("ALTER TABLE session_titles ADD COLUMN category TEXT NOT NULL DEFAULT 'chat_with_history'")
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" not in str(e):
+                raise
 
 
 workflow = StateGraph(State)
 
-def answer_node(state: State) -> dict[str, Any]:
+async def answer_node(state: State) -> dict[str, Any]:
     query = state.current_query
     role = "チャットアシスタント"
     # request_model_id を優先して使用し、ない場合はデフォルト値を使用
@@ -96,7 +88,7 @@ def answer_node(state: State) -> dict[str, Any]:
     messages.extend(state.chat_history)
     messages.append(HumanMessage(content=query))
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
 
     # model_idを返さないようにして、チェックポイントで上書きされないようにする
     return {"last_response": response.content, "chat_history": [HumanMessage(content=query), AIMessage(content=response.content)], "current_role": role}
@@ -106,9 +98,20 @@ workflow.add_node("answer_node", answer_node)
 workflow.add_edge(START, "answer_node")
 workflow.add_edge("answer_node", END)
 
-graph = workflow.compile(checkpointer=checkpointer)
+# グラフは非同期チェックポインターと共に遅延コンパイルする
+_graph = None
+_graph_checkpointer = None
 
-def generate_chat_title(first_user_message: str, model_id: str = DEFAULT_CHAT_MODEL_ID) -> str:
+async def get_graph():
+    """チャット履歴グラフを取得（必要に応じてコンパイル）"""
+    global _graph, _graph_checkpointer
+    checkpointer = await get_checkpointer()
+    if _graph is None or _graph_checkpointer is not checkpointer:
+        _graph = workflow.compile(checkpointer=checkpointer)
+        _graph_checkpointer = checkpointer
+    return _graph
+
+async def generate_chat_title(first_user_message: str, model_id: str = DEFAULT_CHAT_MODEL_ID) -> str:
     """
     チャットの最初のユーザーメッセージから要約タイトルを生成
     
@@ -142,7 +145,7 @@ def generate_chat_title(first_user_message: str, model_id: str = DEFAULT_CHAT_MO
 
 タイトルのみを出力してください。"""
         
-        response = llm.invoke([HumanMessage(content=title_prompt)])
+        response = await llm.ainvoke([HumanMessage(content=title_prompt)])
         title = response.content.strip()
         
         # 30文字を超える場合は省略
@@ -168,17 +171,16 @@ def save_session_title(thread_id: str, title: str, category: str = "chat_with_hi
         セッションカテゴリ（デフォルト: "chat_with_history"）
         "chat_with_history" または "chat_with_agents"
     """
-    cursor = conn.cursor()
     now = datetime.now()
-    cursor.execute("""
-        INSERT INTO session_titles (thread_id, title, created_at, updated_at, message_count, last_message_at, category)
-        VALUES (?, ?, ?, ?, 0, ?, ?)
-        ON CONFLICT(thread_id) DO UPDATE SET
-            title = excluded.title,
-            updated_at = ?,
-            category = excluded.category
-    """, (thread_id, title, now, now, now, category, now))
-    conn.commit()
+    with pool.writer() as conn:
+        conn.execute("""
+            INSERT INTO session_titles (thread_id, title, created_at, updated_at, message_count, last_message_at, category)
+            VALUES (?, ?, ?, ?, 0, ?, ?)
+            ON CONFLICT(thread_id) DO UPDATE SET
+                title = excluded.title,
+                updated_at = ?,
+                category = excluded.category
+        """, (thread_id, title, now, now, now, category, now))
 
 def get_session_title(thread_id: str) -> str | None:
     """
@@ -194,9 +196,8 @@ def get_session_title(thread_id: str) -> str | None:
     str | None
         セッションタイトル（存在しない場合はNone）
     """
-    cursor = conn.cursor()
-    cursor.execute("SELECT title FROM session_titles WHERE thread_id = ?", (thread_id,))
-    result = cursor.fetchone()
+    with pool.reader() as conn:
+        result = conn.execute("SELECT title FROM session_titles WHERE thread_id = ?", (thread_id,)).fetchone()
     return result[0] if result else None
 
 def get_all_sessions() -> List[Dict[str, Any]]:
@@ -208,15 +209,15 @@ def get_all_sessions() -> List[Dict[str, Any]]:
     List[Dict[str, Any]]
         セッション情報のリスト（thread_id, title, updated_at, message_count, last_message_at, category）
     """
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT thread_id, title, updated_at, message_count, last_message_at, category 
-        FROM session_titles 
-        ORDER BY last_message_at DESC, updated_at DESC
-    """)
+    with pool.reader() as conn:
+        rows = conn.execute("""
+            SELECT thread_id, title, updated_at, message_count, last_message_at, category 
+            FROM session_titles 
+            ORDER BY last_message_at DESC, updated_at DESC
+        """).fetchall()
     
     sessions = []
-    for row in cursor.fetchall():
+    for row in rows:
         sessions.append({
             "thread_id": row[0],
             "title": row[1],
@@ -242,16 +243,16 @@ def get_sessions_by_category(category: str) -> List[Dict[str, Any]]:
     List[Dict[str, Any]]
         セッション情報のリスト（thread_id, title, updated_at, message_count, last_message_at, category）
     """
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT thread_id, title, updated_at, message_count, last_message_at, category 
-        FROM session_titles 
-        WHERE category = ?
-        ORDER BY last_message_at DESC, updated_at DESC
-    """, (category,))
+    with pool.reader() as conn:
+        rows = conn.execute("""
+            SELECT thread_id, title, updated_at, message_count, last_message_at, category 
+            FROM session_titles 
+            WHERE category = ?
+            ORDER BY last_message_at DESC, updated_at DESC
+        """, (category,)).fetchall()
     
     sessions = []
-    for row in cursor.fetchall():
+    for row in rows:
         sessions.append({
             "thread_id": row[0],
             "title": row[1],
@@ -263,7 +264,7 @@ def get_sessions_by_category(category: str) -> List[Dict[str, Any]]:
     
     return sessions
 
-def get_messages_for_session(thread_id: str) -> List[Dict[str, Any]]:
+async def get_messages_for_session(thread_id: str) -> List[Dict[str, Any]]:
     """
     指定されたセッションのメッセージ履歴を取得（信頼性の高い方法に修正）
     
@@ -280,7 +281,8 @@ def get_messages_for_session(thread_id: str) -> List[Dict[str, Any]]:
     try:
         # 特定のスレッドの最新のチェックポイントを取得
         config = {"configurable": {"thread_id": thread_id}}
-        checkpoint = checkpointer.get(config)
+        checkpointer = await get_checkpointer()
+        checkpoint = await checkpointer.aget(config)
 
         if not checkpoint or "channel_values" not in checkpoint:
             return []
@@ -309,7 +311,11 @@ def get_messages_for_session(thread_id: str) -> List[Dict[str, Any]]:
         print(f"メッセージ取得エラー (get_messages_for_session): {e}")
         return []
 
-def delete_session(thread_id: str) -> bool:
+def _delete_session_title(thread_id: str):
+    with pool.writer() as conn:
+        conn.execute("DELETE FROM session_titles WHERE thread_id = ?", (thread_id,))
+
+async def delete_session(thread_id: str) -> bool:
     """
     指定されたセッションを削除
     
@@ -325,20 +331,18 @@ def delete_session(thread_id: str) -> bool:
     """
     try:
         # セッションタイトルを削除
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM session_titles WHERE thread_id = ?", (thread_id,))
+        await run_blocking(_delete_session_title, thread_id)
         
-        # チェックポイントデータも削除
-        # LangGraphのSqliteSaverから直接削除
-        cursor.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        # チェックポイントデータも削除（書き込み履歴を含む）
+        checkpointer = await get_checkpointer()
+        await checkpointer.adelete_thread(thread_id)
         
-        conn.commit()
         return True
     except Exception as e:
         print(f"セッション削除エラー: {e}")
         return False
 
-def chat_history(query: str, thread_id: str = "default", model_id: str = DEFAULT_CHAT_MODEL_ID, category: str = "chat_with_history") -> dict[str, Any]:
+async def chat_history(query: str, thread_id: str = "default", model_id: str = DEFAULT_CHAT_MODEL_ID, category: str = "chat_with_history") -> dict[str, Any]:
     """
     チャット履歴を保持した会話機能
     
@@ -359,14 +363,15 @@ def chat_history(query: str, thread_id: str = "default", model_id: str = DEFAULT
         グラフの実行結果（last_responseなどを含む）
     """
     # タイトル生成が必要かどうかをチェック
-    existing_title = get_session_title(thread_id)
+    existing_title = await run_blocking(get_session_title, thread_id)
     should_generate_title = (
         not existing_title or 
         existing_title in ['新しいチャット', 'チャットを開始中...']
     )
     
     # AI応答を生成（request_model_idのみ渡す）
-    result = graph.invoke(
+    graph = await get_graph()
+    result = await graph.ainvoke(
         {"current_query": query, "request_model_id": model_id},
         config={"configurable": {"thread_id": thread_id}}
     )
@@ -374,29 +379,39 @@ def chat_history(query: str, thread_id: str = "default", model_id: str = DEFAULT
     # AI応答が成功した場合のみタイトルを生成・更新
     if should_generate_title and result.get("last_response"):
         try:
-            title = generate_chat_title(query, model_id)
-            save_session_title(thread_id, title, category)
+            title = await generate_chat_title(query, model_id)
+            await run_blocking(save_session_title, thread_id, title, category)
             result["updated_title"] = title
         except Exception as e:
             print(f"タイトル生成エラー: {e}")
             
     # メッセージ数と最終メッセージ時刻を更新
     try:
-        messages = get_messages_for_session(thread_id)
-        message_count = len(messages)
-        last_message_at = datetime.now()
+        messages = await get_messages_for_session(thread_id)
+        await run_blocking(update_session_stats, thread_id, len(messages))
+    except Exception as e:
+        print(f"セッションメタデータ更新エラー: {e}")
+    
+    return result
 
-        cursor = conn.cursor()
-        cursor.execute("""
+def update_session_stats(thread_id: str, message_count: int):
+    """
+    セッションのメッセージ数と最終メッセージ時刻を更新
+    
+    Parameters
+    ----------
+    thread_id : str
+        セッションID
+    message_count : int
+        現在のメッセージ数
+    """
+    last_message_at = datetime.now()
+    with pool.writer() as conn:
+        conn.execute("""
             UPDATE session_titles
             SET message_count = ?, last_message_at = ?, updated_at = ?
             WHERE thread_id = ?
         """, (message_count, last_message_at, last_message_at, thread_id))
-        conn.commit()
-    except Exception as e:
-        print(f"セッションメタデータ更新エラー: {e}")
-    
-    return result
 
 # すべての関数定義が完了した後に初期化を実行
 setup_session_titles_table()
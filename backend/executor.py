@@ -0,0 +1,32 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# 非同期APIを持たない同期処理（Chroma、SQLite、同期LLM呼び出しなど）を実行する上限付きスレッドプール
+# デフォルトのエグゼキューターを共有しないことで、重い処理がFastAPIの同期エンドポイント用スレッドを食い潰さないようにする
+BLOCKING_MAX_WORKERS = int(os.getenv("BLOCKING_MAX_WORKERS", "16"))
+
+_blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_MAX_WORKERS, thread_name_prefix="blocking")
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    同期関数を上限付きスレッドプールで実行し、イベントループを塞がずに結果を待つ
+    
+    Args:
+        func: 実行する同期関数
+        *args: 関数に渡す位置引数
+        **kwargs: 関数に渡すキーワード引数
+    
+    Returns:
+        関数の戻り値
+    """
+    loop = asyncio.get_running_loop()
+    # LangChainのコールバックなどコンテキスト変数を引き継ぐ
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_blocking_executor, call)
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from langchain_text_splitters import CharacterTextSplitter
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
+from executor import run_blocking
 from models import get_embeddings_model, get_model_instance, DEFAULT_CHAT_MODEL_ID
 from langchain_core.documents import Document
 
@@ -198,9 +199,9 @@ def upload_and_add_document(file_content, filename):
     except Exception as e:
         return f"エラー: アップロード処理中にエラーが発生しました: {str(e)}"
 
-def vector_search_flow(vector_store, query, document_filter=None, model_name=DEFAULT_CHAT_MODEL_ID):
+def build_qa_chain(vector_store, document_filter=None, model_name=DEFAULT_CHAT_MODEL_ID):
     """
-    ベクトル検索を実行する
+    ベクトル検索用のRetrievalQAチェーンを作成する
     document_filter: 特定のドキュメントに絞り込む場合のフィルター
     model_name: 使用するモデル名
     """
@@ -217,12 +218,32 @@ def vector_search_flow(vector_store, query, document_filter=None, model_name=DEF
     model = get_model_instance(model_name)
 
     # チェーンを作成
-    qa_chain = RetrievalQA.from_chain_type(llm=model, retriever=retriever)
+    return RetrievalQA.from_chain_type(llm=model, retriever=retriever)
+
+def vector_search_flow(vector_store, query, document_filter=None, model_name=DEFAULT_CHAT_MODEL_ID):
+    """
+    ベクトル検索を実行する
+    document_filter: 特定のドキュメントに絞り込む場合のフィルター
+    model_name: 使用するモデル名
+    """
+    qa_chain = build_qa_chain(vector_store, document_filter, model_name)
 
     # チェーンを実行
     answer = qa_chain.invoke(query)
     return answer
 
+async def avector_search_flow(vector_store, query, document_filter=None, model_name=DEFAULT_CHAT_MODEL_ID):
+    """
+    ベクトル検索を非同期で実行する（LLM呼び出しは ainvoke、Chroma検索はエグゼキューター経由）
+    document_filter: 特定のドキュメントに絞り込む場合のフィルター
+    model_name: 使用するモデル名
+    """
+    qa_chain = build_qa_chain(vector_store, document_filter, model_name)
+
+    # チェーンを実行
+    answer = await qa_chain.ainvoke(query)
+    return answer
+
 def get_supported_formats():
     """
     サポートされているファイル形式のリストを返す
@@ -244,6 +265,15 @@ def get_rag_flow(query, selected_document=None, model_name=DEFAULT_CHAT_MODEL_ID
     answer = vector_search_flow(vector_store, query, selected_document, model_name)
     return answer["result"]
 
+async def aget_rag_flow(query, selected_document=None, model_name=DEFAULT_CHAT_MODEL_ID, embedding_model_id="embedding-gemini"):
+    """
+    RAG機能のメインフロー（非同期版）
+    永続クライアントの生成は同期処理のため、上限付きエグゼキューターで実行する
+    """
+    vector_store = await run_blocking(load_or_create_vector_store, embedding_model_id)
+    answer = await avector_search_flow(vector_store, query, selected_document, model_name)
+    return answer["result"]
+
 if __name__ == "__main__":
     # ベクトルストアを作成
     vector_store = load_or_create_vector_store()
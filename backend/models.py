@@ -88,6 +88,7 @@ def get_embedding_model_info(model_id: str) -> Dict[str, str]:
 _model_cache: Dict[str, Union[ChatGoogleGenerativeAI, AzureChatOpenAI]] = {}
 _embeddings_cache: Dict[str, Union[GoogleGenerativeAIEmbeddings, AzureOpenAIEmbeddings]] = {}
 _client_cache: Dict[str, Union[genai.GenerativeModel, openai.AzureOpenAI]] = {}
+_async_client_cache: Dict[str, openai.AsyncAzureOpenAI] = {}
 
 def get_model_instance(model_id: str, temperature: float = 0.0) -> Union[ChatGoogleGenerativeAI, AzureChatOpenAI]:
     """
@@ -179,6 +180,47 @@ def get_model_client(model_id: str, **kwargs) -> Union[genai.GenerativeModel, op
     
     return _client_cache[cache_key]
 
+def get_async_model_client(model_id: str, **kwargs) -> Union[genai.GenerativeModel, openai.AsyncAzureOpenAI]:
+    """
+    モデル名だけを引数で渡して非同期呼び出し可能なクライアントを返却
+    
+    Args:
+        model_id: モデルID (例: "gemini-2.5-pro", "gpt-4o")
+        **kwargs: 追加の設定パラメータ
+    
+    Returns:
+        Union[genai.GenerativeModel, openai.AsyncAzureOpenAI]: ネイティブクライアント
+        （GenerativeModel は generate_content_async を持つためそのまま共有する）
+    """
+    if not is_valid_model(model_id):
+        raise ValueError(f"無効なモデルID: {model_id}. 利用可能なモデル: {AVAILABLE_MODELS}")
+    
+    provider = get_model_provider(model_id)
+    
+    if provider == "google":
+        return get_model_client(model_id, **kwargs)
+    elif provider == "azure":
+        cache_key = f"async_client_{model_id}_{hash(str(sorted(kwargs.items())))}"
+        
+        if cache_key not in _async_client_cache:
+            azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+            api_key = os.getenv("AZURE_OPENAI_API_KEY")
+            api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+            
+            if not azure_endpoint or not api_key:
+                raise ValueError("Azure OpenAI の環境変数が設定されていません: AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY")
+            
+            _async_client_cache[cache_key] = openai.AsyncAzureOpenAI(
+                azure_endpoint=azure_endpoint,
+                api_key=api_key,
+                api_version=api_version,
+                **kwargs
+            )
+        
+        return _async_client_cache[cache_key]
+    else:
+        raise ValueError(f"サポートされていないプロバイダー: {provider}")
+
 def get_embeddings_model(embedding_model_id: str = "embedding-gemini") -> Union[GoogleGenerativeAIEmbeddings, AzureOpenAIEmbeddings]:
     """
     エンベディングモデルIDからエンベディングモデルインスタンスを取得（キャッシュ付き）
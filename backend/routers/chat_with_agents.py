@@ -16,6 +16,7 @@ from agents.deep_research import (
     save_deep_research_session_title,
     delete_deep_research_session
 )
+from executor import run_blocking
 from models import DEFAULT_CHAT_MODEL_ID
 
 router = APIRouter()
@@ -56,7 +57,8 @@ async def deep_research_chat_endpoint(request: ChatRequest):
         thread_id = str(uuid.uuid4())
         
         # Deep Research エージェントを実行（統一されたDB使用）
-        result = deep_research_chat(request.message, thread_id=thread_id, model_id=request.model)
+        # 同期チェックポインターを使うグラフのため、イベントループを塞がないようスレッドプールで実行
+        result = await run_blocking(deep_research_chat, request.message, thread_id=thread_id, model_id=request.model)
         
         # 結果から応答を取得
         ai_response = result.get("response", "")
@@ -111,7 +113,7 @@ async def get_deep_research_session_messages(session_id: str):
     """特定のDeep Researchセッションのメッセージ履歴を取得"""
     try:
         # チェックポイントから履歴を取得
-        messages = get_deep_research_history(session_id)
+        messages = await run_blocking(get_deep_research_history, session_id)
         return [
             MessageResponse(
                 role=msg["role"],
@@ -158,7 +160,7 @@ async def continue_deep_research_chat(session_id: str, request: ChatRequest):
             raise HTTPException(status_code=404, detail="セッションが見つかりません")
         
         # Deep Research エージェントを実行（既存のthread_idで継続）
-        result = deep_research_chat(request.message, thread_id=session_id, model_id=request.model)
+        result = await run_blocking(deep_research_chat, request.message, thread_id=session_id, model_id=request.model)
         
         # 結果から応答を取得
         ai_response = result.get("response", "")
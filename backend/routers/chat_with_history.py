@@ -9,6 +9,7 @@ import msgpack
 from datetime import datetime
 
 
+from executor import run_blocking
 from models import get_available_models, is_valid_model, Model, get_model_instance, get_available_embedding_models, DEFAULT_CHAT_MODEL_ID
 from chathistory.langgraph_chathistory import (
     chat_history, 
@@ -107,7 +108,7 @@ async def chat_with_history(request: ChatWithHistoryRequest):
             raise HTTPException(status_code=400, detail="無効なモデルが指定されました。")
         
         # チャット履歴機能を呼び出し（モデルIDとカテゴリを渡す）
-        result = chat_history(request.message, request.thread_id, request.model_id, "chat_with_history")
+        result = await chat_history(request.message, request.thread_id, request.model_id, "chat_with_history")
         
         response = ChatWithHistoryResponse(
             reply=result.get("last_response", ""),
@@ -127,7 +128,7 @@ async def get_chat_sessions():
     Chat with Historyカテゴリのチャットセッション一覧を取得します。
     """
     try:
-        sessions = get_sessions_by_category("chat_with_history")
+        sessions = await run_blocking(get_sessions_by_category, "chat_with_history")
         return [
             ChatSession(
                 thread_id=session["thread_id"],
@@ -147,7 +148,7 @@ async def get_session_messages(session_id: str):
     指定されたセッションIDの全メッセージを取得します。
     """
     try:
-        messages = get_messages_for_session(session_id)
+        messages = await get_messages_for_session(session_id)
         return [
             ChatMessage(
                 role=msg["role"],
@@ -165,7 +166,7 @@ async def get_session_title_endpoint(session_id: str):
     指定されたセッションのタイトルを取得します。
     """
     try:
-        title = get_session_title(session_id)
+        title = await run_blocking(get_session_title, session_id)
         if title is None:
             raise HTTPException(status_code=404, detail="セッションが見つかりません")
         return {"title": title}
@@ -188,7 +189,7 @@ async def update_session_title(session_id: str, request: UpdateTitleRequest):
             raise HTTPException(status_code=400, detail="タイトルが長すぎます（100文字以内）")
         
         # タイトルを保存（Chat with Historyカテゴリ）
-        save_session_title(session_id, request.title.strip(), "chat_with_history")
+        await run_blocking(save_session_title, session_id, request.title.strip(), "chat_with_history")
         
         return {"message": "タイトルが更新されました", "title": request.title.strip()}
     except HTTPException:
@@ -202,7 +203,7 @@ async def delete_chat_session(session_id: str):
     指定されたセッションを削除します。
     """
     try:
-        success = delete_session(session_id)
+        success = await delete_session(session_id)
         if not success:
             raise HTTPException(status_code=404, detail="セッションが見つかりません、または削除に失敗しました")
         
@@ -223,7 +224,7 @@ async def create_chat_session():
         
         # 初期タイトルを設定（Chat with Historyカテゴリ）
         initial_title = "チャットを開始中..."
-        save_session_title(new_thread_id, initial_title, "chat_with_history")
+        await run_blocking(save_session_title, new_thread_id, initial_title, "chat_with_history")
         
         return {
             "thread_id": new_thread_id,
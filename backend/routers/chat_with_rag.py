@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel
 from typing import List, Optional
-from langchain_rag.langchain_rag import get_rag_flow, get_documents_list, upload_and_add_document, delete_document_from_vector_store
+from executor import run_blocking
+from langchain_rag.langchain_rag import aget_rag_flow, get_documents_list, upload_and_add_document, delete_document_from_vector_store
 from models import is_valid_model, is_valid_embedding_model, Model, get_available_models, get_available_embedding_models
 
 router = APIRouter()
@@ -46,7 +47,7 @@ async def get_documents():
     """
     ベクトルストアに保存されているドキュメントの一覧を取得します。
     """
-    documents = get_documents_list()
+    documents = await run_blocking(get_documents_list)
     return documents
 
 @router.post("/upload", response_model=ApiResponse)
@@ -73,7 +74,7 @@ async def upload_document(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="ファイルサイズが大きすぎます（最大10MB）")
         
         # アップロードとベクトルストアへの追加
-        result = upload_and_add_document(file_content, file.filename)
+        result = await run_blocking(upload_and_add_document, file_content, file.filename)
         
         if result.startswith("✅"):
             return ApiResponse(success=True, message=result)
@@ -89,7 +90,7 @@ async def delete_document(request: DeleteDocumentRequest):
     ベクトルストアからドキュメントを削除します。
     """
     try:
-        result = delete_document_from_vector_store(request.source_path)
+        result = await run_blocking(delete_document_from_vector_store, request.source_path)
         
         if result.startswith("✅"):
             return ApiResponse(success=True, message=result)
@@ -112,7 +113,7 @@ async def langchain_rag(request: ChatRequest):
     
     try:
         embedding_model_id = request.embedding_model or "embedding-gemini"
-        answer = get_rag_flow(request.message, request.selected_document, request.model, embedding_model_id)
+        answer = await aget_rag_flow(request.message, request.selected_document, request.model, embedding_model_id)
         return ChatResponse(reply=answer)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
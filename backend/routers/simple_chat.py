@@ -1,9 +1,11 @@
 import os
+import json
 import google.generativeai as genai
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
-from models import AVAILABLE_MODELS, is_valid_model, get_available_models, get_available_embedding_models, get_model_client, get_model_provider, Model
+from typing import AsyncIterator, Dict, List
+from models import AVAILABLE_MODELS, is_valid_model, get_available_models, get_available_embedding_models, get_async_model_client, get_model_provider, Model
 
 router = APIRouter()
 
@@ -28,21 +30,7 @@ async def get_embedding_models():
     """
     return get_available_embedding_models()
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """
-    ユーザーからのメッセージを受け取り、指定されたモデルを使用して応答を生成します。
-    """
-    if not is_valid_model(request.model):
-        raise HTTPException(status_code=400, detail="無効なモデルが指定されました。")
-    
-    try:
-        provider = get_model_provider(request.model)
-        
-        if provider == "google":
-            # Google Generative AI クライアントを使用
-            model = get_model_client(request.model)
-            prompt = f"""
+GOOGLE_PROMPT_TEMPLATE = """
             以下のガイドラインに従って、ユーザーとの会話を行ってください。
             ---
             ## あなたの役割
@@ -75,28 +63,47 @@ async def chat(request: ChatRequest):
             ```
             
             # ユーザーの質問
-            {request.message}
+            {message}
             """
-            response = model.generate_content(prompt)
+
+AZURE_SYSTEM_PROMPT = """あなたはフレンドリーかつプロフェッショナルなAIチャットアシスタントです。
+                        ユーザーの質問に対して、正確かつ分かりやすく、簡潔に回答してください。
+                        必要に応じてMarkdown形式を使用してください。"""
+
+def build_google_prompt(message: str) -> str:
+    """Google Generative AI 用のプロンプトを作成します。"""
+    return GOOGLE_PROMPT_TEMPLATE.format(message=message)
+
+def build_azure_messages(message: str) -> List[Dict[str, str]]:
+    """Azure OpenAI 用のメッセージリストを作成します。"""
+    return [
+        {"role": "system", "content": AZURE_SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """
+    ユーザーからのメッセージを受け取り、指定されたモデルを使用して応答を生成します。
+    """
+    if not is_valid_model(request.model):
+        raise HTTPException(status_code=400, detail="無効なモデルが指定されました。")
+    
+    try:
+        provider = get_model_provider(request.model)
+        
+        if provider == "google":
+            # Google Generative AI クライアントを使用
+            model = get_async_model_client(request.model)
+            response = await model.generate_content_async(build_google_prompt(request.message))
             return ChatResponse(reply=response.text)
             
         elif provider == "azure":
             # Azure OpenAI クライアントを使用
-            client = get_model_client(request.model)
-            response = client.chat.completions.create(
+            client = get_async_model_client(request.model)
+            response = await client.chat.completions.create(
                 model=request.model,  # デプロイメント名
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """あなたはフレンドリーかつプロフェッショナルなAIチャットアシスタントです。
-                        ユーザーの質問に対して、正確かつ分かりやすく、簡潔に回答してください。
-                        必要に応じてMarkdown形式を使用してください。"""
-                    },
-                    {
-                        "role": "user",
-                        "content": request.message
-                    }
-                ],
+                messages=build_azure_messages(request.message),
                 temperature=0.0
             )
             return ChatResponse(reply=response.choices[0].message.content)
@@ -105,4 +112,68 @@ async def chat(request: ChatRequest):
         
     except Exception as e:
         # エラーログを記録することが望ましい
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+async def stream_reply(model_id: str, message: str) -> AsyncIterator[str]:
+    """
+    プロバイダーに応じて、生成された応答テキストの断片を順に返します。
+    """
+    provider = get_model_provider(model_id)
+
+    if provider == "google":
+        # Google Generative AI クライアントを使用
+        model = get_async_model_client(model_id)
+        response = await model.generate_content_async(build_google_prompt(message), stream=True)
+        async for chunk in response:
+            # セーフティフィルタ等でテキストを持たないチャンクは読み飛ばす
+            if chunk.parts:
+                yield chunk.text
+
+    elif provider == "azure":
+        # Azure OpenAI クライアントを使用
+        client = get_async_model_client(model_id)
+        stream = await client.chat.completions.create(
+            model=model_id,  # デプロイメント名
+            messages=build_azure_messages(message),
+            temperature=0.0,
+            stream=True
+        )
+        async for chunk in stream:
+            # 先頭のコンテンツフィルタ結果などは choices が空で届く
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    else:
+        raise ValueError(f"サポートされていないプロバイダー: {provider}")
+
+@router.post("/chat-stream")
+async def chat_stream(request: ChatRequest):
+    """
+    ユーザーからのメッセージを受け取り、生成されたトークンをServer-Sent Eventsで逐次返します。
+    """
+    if not is_valid_model(request.model):
+        raise HTTPException(status_code=400, detail="無効なモデルが指定されました。")
+
+    async def generate_stream():
+        try:
+            yield f"data: {json.dumps({'type': 'start', 'model': request.model})}\n\n"
+
+            async for content in stream_reply(request.model, request.message):
+                data = json.dumps({'type': 'token', 'content': content}, ensure_ascii=False)
+                yield f"data: {data}\n\n"
+
+            # ストリーム終了シグナル
+            yield f"data: {json.dumps({'type': 'end'})}\n\n"
+
+        except Exception as e:
+            error_data = json.dumps({'type': 'error', 'message': str(e)}, ensure_ascii=False)
+            yield f"data: {error_data}\n\n"
+
+    return StreamingResponse(
+        generate_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # nginx用のバッファリング無効化
+        }
+    )
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# テスト実行時にリポジトリ内のチャット履歴DBを汚さないよう、一時ディレクトリのDBを使用する
+os.environ.setdefault("SQLITE_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="chathistory-test-"), "chathistory.db"))
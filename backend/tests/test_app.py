@@ -1,7 +1,8 @@
+import json
 import os
 import shutil
 import sys
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -39,15 +40,15 @@ def test_chat_success(client):
     mock_response.text = "こんにちは！"
 
     mock_model = MagicMock()
-    mock_model.generate_content.return_value = mock_response
+    mock_model.generate_content_async = AsyncMock(return_value=mock_response)
 
-    with patch("routers.simple_chat.get_model_client", return_value=mock_model) as mock_get_model_client:
+    with patch("routers.simple_chat.get_async_model_client", return_value=mock_model) as mock_get_model_client:
         response = client.post("/api/chat", json={"message": "こんにちは", "model": DEFAULT_CHAT_MODEL_ID})
 
     assert response.status_code == 200
     assert response.json() == {"reply": "こんにちは！"}
     mock_get_model_client.assert_called_once_with(DEFAULT_CHAT_MODEL_ID)
-    mock_model.generate_content.assert_called_once()
+    mock_model.generate_content_async.assert_awaited_once()
 
 
 @pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY is not set")
@@ -64,9 +65,9 @@ def test_chat_integration(client):
 def test_chat_api_error(client):
     """/api/chatエンドポイントでAPIエラーが発生するケースをテスト"""
     mock_model = MagicMock()
-    mock_model.generate_content.side_effect = Exception("API Error")
+    mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
 
-    with patch("routers.simple_chat.get_model_client", return_value=mock_model):
+    with patch("routers.simple_chat.get_async_model_client", return_value=mock_model):
         response = client.post("/api/chat", json={"message": "エラーを発生させてください", "model": DEFAULT_CHAT_MODEL_ID})
 
     assert response.status_code == 500
@@ -74,6 +75,85 @@ def test_chat_api_error(client):
     assert response.json()["detail"] == "API Error"
 
 
+def parse_sse_events(body: str):
+    """SSEレスポンス本文をイベント（dict）のリストに変換"""
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def test_chat_stream_google(client):
+    """/api/chat-streamエンドポイントがGoogleのトークンをSSEで返すことをテスト"""
+    chunks = []
+    for text in ["こん", "にちは", "！"]:
+        chunk = MagicMock()
+        chunk.parts = [text]
+        chunk.text = text
+        chunks.append(chunk)
+
+    async def stream_chunks():
+        for chunk in chunks:
+            yield chunk
+
+    mock_model = MagicMock()
+    mock_model.generate_content_async = AsyncMock(return_value=stream_chunks())
+
+    with patch("routers.simple_chat.get_async_model_client", return_value=mock_model):
+        response = client.post("/api/chat-stream", json={"message": "こんにちは", "model": DEFAULT_CHAT_MODEL_ID})
+
+    assert response.status_code == 200
+    assert "text/event-stream" in response.headers["content-type"]
+    events = parse_sse_events(response.text)
+    assert events[0]["type"] == "start"
+    assert [e["content"] for e in events if e["type"] == "token"] == ["こん", "にちは", "！"]
+    assert events[-1] == {"type": "end"}
+    assert mock_model.generate_content_async.call_args.kwargs["stream"] is True
+
+
+def test_chat_stream_azure(client):
+    """/api/chat-streamエンドポイントがAzureのdeltaをSSEで返すことをテスト"""
+    def make_chunk(content):
+        chunk = MagicMock()
+        if content is None:
+            chunk.choices = []
+        else:
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = content
+        return chunk
+
+    async def stream_chunks():
+        for content in [None, "Hello", " world"]:
+            yield make_chunk(content)
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=stream_chunks())
+
+    with patch("routers.simple_chat.get_model_provider", return_value="azure"), \
+         patch("routers.simple_chat.get_async_model_client", return_value=mock_client):
+        response = client.post("/api/chat-stream", json={"message": "hi", "model": DEFAULT_CHAT_MODEL_ID})
+
+    events = parse_sse_events(response.text)
+    assert [e["content"] for e in events if e["type"] == "token"] == ["Hello", " world"]
+    assert events[-1] == {"type": "end"}
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+def test_chat_stream_api_error(client):
+    """/api/chat-streamでAPIエラーが発生した場合にerrorイベントが送られることをテスト"""
+    mock_model = MagicMock()
+    mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
+
+    with patch("routers.simple_chat.get_async_model_client", return_value=mock_model):
+        response = client.post("/api/chat-stream", json={"message": "エラー", "model": DEFAULT_CHAT_MODEL_ID})
+
+    events = parse_sse_events(response.text)
+    assert events[-1] == {"type": "error", "message": "API Error"}
+
+
+def test_chat_stream_invalid_model(client):
+    """/api/chat-streamで無効なモデルを指定した場合に400が返ることをテスト"""
+    response = client.post("/api/chat-stream", json={"message": "こんにちは", "model": "invalid-model"})
+    assert response.status_code == 400
+
+
 def test_serve_spa_root(client):
     """ルートパスへのGETリクエストがindex.htmlを返すことをテスト"""
     response = client.get("/")
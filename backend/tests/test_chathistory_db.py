@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+
+# appモジュールをインポートするために、backendディレクトリをsys.pathに追加
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from chathistory.db import SqliteConnectionPool
+
+
+def make_pool(tmp_path, read_pool_size=2):
+    pool = SqliteConnectionPool(str(tmp_path / "chathistory.db"), read_pool_size=read_pool_size)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO items (value) VALUES ('committed')")
+    return pool
+
+
+def test_reads_proceed_while_writer_holds_transaction(tmp_path):
+    """書き込みトランザクション中でも読み取り用コネクションがブロックされないことをテスト"""
+    pool = make_pool(tmp_path)
+    writing = threading.Event()
+    release = threading.Event()
+
+    def long_write():
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('pending')")
+            writing.set()
+            release.wait(timeout=5)
+
+    writer_thread = threading.Thread(target=long_write)
+    writer_thread.start()
+    try:
+        assert writing.wait(timeout=5)
+        with pool.reader() as conn:
+            values = [row[0] for row in conn.execute("SELECT value FROM items ORDER BY id")]
+        # 未コミットの書き込みは見えないが、読み取り自体は待たされない
+        assert values == ["committed"]
+    finally:
+        release.set()
+        writer_thread.join()
+
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+    pool.close()
+
+
+def test_writer_rolls_back_on_error(tmp_path):
+    """書き込み中に例外が発生した場合にロールバックされることをテスト"""
+    pool = make_pool(tmp_path)
+    try:
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('rolled back')")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    pool.close()
+
+
+def test_readers_are_bounded_and_read_only(tmp_path):
+    """読み取り用コネクション数が上限を超えず、書き込みが拒否されることをテスト"""
+    pool = make_pool(tmp_path, read_pool_size=1)
+    with pool.reader() as first:
+        try:
+            first.execute("INSERT INTO items (value) VALUES ('x')")
+            assert False, "読み取り用コネクションで書き込みができてしまった"
+        except Exception as e:
+            assert "readonly" in str(e)
+    with pool.reader() as second:
+        # 上限1のため同じコネクションが再利用される
+        assert second is first
+    pool.close()
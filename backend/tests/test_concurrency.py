@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+
+# appモジュールをインポートするために、backendディレクトリをsys.pathに追加
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app
+from models import DEFAULT_CHAT_MODEL_ID
+
+CONCURRENT_REQUESTS = 8
+PROVIDER_LATENCY = 0.3
+
+
+async def fire_concurrently(path: str, payloads: list):
+    """複数のリクエストを同時に送信し、レスポンスと所要時間を返す"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[client.post(path, json=payload) for payload in payloads])
+        return responses, time.perf_counter() - started
+
+
+def test_chat_requests_do_not_serialize():
+    """/api/chatへの同時リクエストがプロバイダー呼び出しで直列化されないことをテスト"""
+    async def slow_generate(*args, **kwargs):
+        await asyncio.sleep(PROVIDER_LATENCY)
+        response = MagicMock()
+        response.text = "こんにちは！"
+        return response
+
+    mock_model = MagicMock()
+    mock_model.generate_content_async = AsyncMock(side_effect=slow_generate)
+
+    with patch("routers.simple_chat.get_async_model_client", return_value=mock_model):
+        responses, elapsed = asyncio.run(
+            fire_concurrently("/api/chat", [{"message": "こんにちは", "model": DEFAULT_CHAT_MODEL_ID}] * CONCURRENT_REQUESTS)
+        )
+
+    assert all(r.status_code == 200 for r in responses)
+    # 直列に処理されると PROVIDER_LATENCY * CONCURRENT_REQUESTS 秒かかる
+    assert elapsed < PROVIDER_LATENCY * CONCURRENT_REQUESTS / 2
+
+
+def test_chat_with_history_requests_do_not_serialize():
+    """/chat-with-historyへの同時リクエストがLLM呼び出しとチェックポイント保存で直列化されないことをテスト"""
+    async def slow_ainvoke(messages):
+        await asyncio.sleep(PROVIDER_LATENCY)
+        return AIMessage(content="応答")
+
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(side_effect=slow_ainvoke)
+
+    payloads = [
+        {"message": "こんにちは", "thread_id": f"load-test-{i}", "model_id": DEFAULT_CHAT_MODEL_ID}
+        for i in range(CONCURRENT_REQUESTS)
+    ]
+    with patch("chathistory.langgraph_chathistory.get_model_instance", return_value=mock_llm):
+        responses, elapsed = asyncio.run(fire_concurrently("/api/langchain/chat-with-history", payloads))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert all(r.json()["reply"] == "応答" for r in responses)
+    # 1リクエストあたり回答生成とタイトル生成の2回LLMを呼ぶ
+    assert elapsed < 2 * PROVIDER_LATENCY * CONCURRENT_REQUESTS / 2